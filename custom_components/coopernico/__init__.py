@@ -2,13 +2,36 @@
 from __future__ import annotations
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_ENTRY_UNLOADED
 from .coordinator import CoopernicoDataUpdateCoordinator
+from .services import async_setup_services
+from .websocket_api import async_register_websocket_commands
+from .worker import shutdown_executor
 
-PLATFORMS: list[Platform] = [Platform.SENSOR]
+PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.SENSOR]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Coopernico component."""
+    async_register_websocket_commands(hass)
+    async_setup_services(hass)
+
+    @callback
+    def _async_shutdown_worker(event: Event) -> None:
+        """Stop the price worker process with Home Assistant."""
+        shutdown_executor()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_shutdown_worker)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -19,8 +42,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
+    # Shift today/tomorrow when the Lisbon date changes, checked every hour
+    entry.async_on_unload(
+        async_track_time_change(hass, coordinator.async_roll_over, minute=0, second=0)
+    )
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if coordinator.estimator is not None:
+        # Fetching the history takes a while; don't hold up setup for it
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_warm_up_estimator(),
+            f"{DOMAIN} estimator warm-up {entry.entry_id}",
+        )
+
     return True
 
 
@@ -28,5 +64,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
+        # End the websocket subscriptions to the discarded coordinator
+        async_dispatcher_send(hass, SIGNAL_ENTRY_UNLOADED.format(entry.entry_id))
+        if not any(
+            coordinator.use_process_pool for coordinator in hass.data[DOMAIN].values()
+        ):
+            shutdown_executor()
 
     return unload_ok
@@ -0,0 +1,120 @@
+"""Binary sensor platform for Coopernico."""
+from __future__ import annotations
+
+from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import (
+    CONF_CHEAPEST_HOURS,
+    CONF_PRICE_PERCENTILE,
+    DEFAULT_CHEAPEST_HOURS,
+    DEFAULT_PRICE_PERCENTILE,
+    DOMAIN,
+)
+from .coordinator import CoopernicoDataUpdateCoordinator
+from .entity import CoopernicoEntity
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Coopernico binary sensor entities."""
+    coordinator: CoopernicoDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    async_add_entities(
+        [
+            CoopernicoCheapestHoursBinarySensor(
+                coordinator,
+                entry.data.get(CONF_CHEAPEST_HOURS, DEFAULT_CHEAPEST_HOURS),
+            ),
+            CoopernicoBelowPercentileBinarySensor(
+                coordinator,
+                entry.data.get(CONF_PRICE_PERCENTILE, DEFAULT_PRICE_PERCENTILE),
+            ),
+        ]
+    )
+
+
+class CoopernicoPriceRankBinarySensor(CoopernicoEntity, BinarySensorEntity):
+    """Base class for binary sensors answered from the coordinator price index."""
+
+    _resolution = "hourly"
+    _track_slots = True
+
+    def _current_rank(self) -> dict | None:
+        """Return the rank of the current price from the coordinator index."""
+        if self.coordinator.data is None:
+            return None
+        return self.coordinator.price_rank(self._resolution, self.coordinator.now())
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return additional state attributes."""
+        rank = self._current_rank()
+        if rank is None:
+            return {}
+
+        return {
+            "rank": rank["rank"],
+            "count": rank["count"],
+            "percentile": rank["percentile"],
+            "last_update": self.coordinator.data.get("last_update"),
+        }
+
+
+class CoopernicoCheapestHoursBinarySensor(CoopernicoPriceRankBinarySensor):
+    """On while the current hour is among the cheapest hours of today."""
+
+    def __init__(
+        self,
+        coordinator: CoopernicoDataUpdateCoordinator,
+        cheapest_hours: int,
+    ) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(coordinator)
+        self.cheapest_hours = cheapest_hours
+        self._attr_unique_id = f"{coordinator.entry.entry_id}_cheapest_hours_today"
+        self._attr_name = (
+            f"{coordinator.entry.title} Coopernico {cheapest_hours} Cheapest Hours (Today)"
+        )
+        self._attr_icon = "mdi:cash-clock"
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return True if the current hour ranks within the cheapest hours."""
+        rank = self._current_rank()
+        if rank is None:
+            return None
+        return rank["rank"] <= self.cheapest_hours
+
+
+class CoopernicoBelowPercentileBinarySensor(CoopernicoPriceRankBinarySensor):
+    """On while the current 15-minute price is below a percentile of today's prices."""
+
+    _resolution = "15min"
+
+    def __init__(
+        self,
+        coordinator: CoopernicoDataUpdateCoordinator,
+        percentile: float,
+    ) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(coordinator)
+        self.percentile = percentile
+        self._attr_unique_id = f"{coordinator.entry.entry_id}_below_percentile_today"
+        self._attr_name = (
+            f"{coordinator.entry.title} Coopernico Below P{percentile:g} (Today)"
+        )
+        self._attr_icon = "mdi:arrow-down-bold-circle-outline"
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return True if the current price is below the configured percentile."""
+        rank = self._current_rank()
+        if rank is None:
+            return None
+        return rank["percentile"] < self.percentile
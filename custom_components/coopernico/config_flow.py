@@ -8,15 +8,24 @@ from homeassistant.const import CONF_NAME
 from homeassistant.data_entry_flow import FlowResult
 
 from .const import (
+    CONF_CHEAPEST_HOURS,
     CONF_DIARIO,
+    CONF_ESTIMATE_TOMORROW,
     CONF_GO_ENABLED,
     CONF_GO_VALUE,
     CONF_MARGIN_K,
+    CONF_PRICE_PERCENTILE,
+    CONF_PROCESS_POOL,
     CONF_TARIFA,
+    CONF_ZONE,
+    DEFAULT_CHEAPEST_HOURS,
     DEFAULT_GO_VALUE,
     DEFAULT_MARGIN_K,
+    DEFAULT_PRICE_PERCENTILE,
+    DEFAULT_ZONE,
     DOMAIN,
     TARIFA_OPTIONS,
+    ZONE_OPTIONS,
 )
 
 
@@ -47,6 +56,15 @@ class CoopernicoConfigFlow(ConfigFlow, domain=DOMAIN):
                 vol.Optional(CONF_TARIFA, default="SIMPLES"): vol.In(TARIFA_OPTIONS),
                 vol.Optional(CONF_DIARIO, default=True): bool,
                 vol.Optional(CONF_GO_ENABLED, default=False): bool,
+                vol.Optional(CONF_ZONE, default=DEFAULT_ZONE): vol.In(ZONE_OPTIONS),
+                vol.Optional(
+                    CONF_CHEAPEST_HOURS, default=DEFAULT_CHEAPEST_HOURS
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=24)),
+                vol.Optional(
+                    CONF_PRICE_PERCENTILE, default=DEFAULT_PRICE_PERCENTILE
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                vol.Optional(CONF_PROCESS_POOL, default=False): bool,
+                vol.Optional(CONF_ESTIMATE_TOMORROW, default=False): bool,
             }
         )
 
@@ -13,6 +13,9 @@ DEFAULT_TSE = 0.0028930
 # Update interval
 UPDATE_INTERVAL = timedelta(hours=1)
 
+# Windows of the "next N hours" average sensors
+ROLLING_WINDOW_HOURS = (1, 3, 6)
+
 # Timezone
 LISBON_TZ = "Europe/Lisbon"
 
@@ -22,6 +25,36 @@ CONF_GO_VALUE = "go_value"
 CONF_TARIFA = "tarifa"
 CONF_DIARIO = "diario"
 CONF_GO_ENABLED = "go_enabled"
+CONF_ZONE = "zone"
+CONF_CHEAPEST_HOURS = "cheapest_hours"
+CONF_PRICE_PERCENTILE = "price_percentile"
+CONF_PROCESS_POOL = "process_pool"
+CONF_ESTIMATE_TOMORROW = "estimate_tomorrow"
+
+# Sent when a config entry unloads, formatted with the entry id
+SIGNAL_ENTRY_UNLOADED = f"{DOMAIN}_entry_unloaded_{{}}"
+
+# Published days fetched once to warm up the day-ahead estimate
+ESTIMATOR_HISTORY_DAYS = 28
+
+# Thresholds of the price binary sensors
+DEFAULT_CHEAPEST_HOURS = 6
+DEFAULT_PRICE_PERCENTILE = 25
+
+# Services
+SERVICE_OPTIMIZE_BATTERY = "optimize_battery"
+SERVICE_PRICE_RANK = "price_rank"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_CAPACITY_KWH = "capacity_kwh"
+ATTR_MAX_POWER_KW = "max_power_kw"
+ATTR_EFFICIENCY = "efficiency"
+ATTR_INITIAL_SOC_KWH = "initial_soc_kwh"
+ATTR_RESOLUTION = "resolution"
+ATTR_DATETIME = "datetime"
 
 # Tariff options (from your app.py)
 TARIFA_OPTIONS = ["SIMPLES", "BI-HORÁRIA", "TRI-HORÁRIA"]
+
+# MIBEL price zones (Portugal, Spain)
+DEFAULT_ZONE = "PT"
+ZONE_OPTIONS = ["PT", "ES"]
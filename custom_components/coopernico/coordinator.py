@@ -2,15 +2,22 @@
 from __future__ import annotations
 
 import logging
-from datetime import date, datetime, timedelta
+from collections.abc import Callable, Iterator
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime, time, timedelta, timezone
 from zoneinfo import ZoneInfo
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DOMAIN, UPDATE_INTERVAL
-from .omie_client import CoopernicoOMIEClient
+from .const import DOMAIN, ESTIMATOR_HISTORY_DAYS, UPDATE_INTERVAL
+from .estimator import DayAheadEstimator
+from .omie_client import CURVE_STEP, CoopernicoOMIEClient, lisbon_now
+from .optimizer import optimize_dispatch
+from .price_buffer import PriceRingBuffer
+from .price_index import PriceIndex
+from .worker import compute_prices, get_executor, shutdown_executor
 
 LISBON_TZ = ZoneInfo("Europe/Lisbon")
 _LOGGER = logging.getLogger(__name__)
@@ -19,16 +26,49 @@ _LOGGER = logging.getLogger(__name__)
 class CoopernicoDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Coopernico data."""
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        clock: Callable[[], datetime] = lisbon_now,
+        fetch_day: Callable | None = None,
+    ) -> None:
         """Initialize."""
         self.entry = entry
+        # Source of the current time for the coordinator, client and entities
+        self.now = clock
+        client_kwargs = {"fetch_day": fetch_day} if fetch_day is not None else {}
         self.client = CoopernicoOMIEClient(
             margin_k=entry.data.get("margin_k", 0.009),
             go_value=entry.data.get("go_value", 0.001),
             tarifa=entry.data.get("tarifa", "SIMPLES"),
             diario=entry.data.get("diario", True),
             go_enabled=entry.data.get("go_enabled", False),
+            zone=entry.data.get("zone", "PT"),
+            clock=clock,
+            **client_kwargs,
         )
+        # Run the pandas computation in a worker process instead of the executor
+        self.use_process_pool = entry.data.get("process_pool", False)
+        # Bumped on every new data or new day so consumers can detect changes
+        self.data_version = 0
+        # Quarter-hour prices from yesterday to the furthest published day
+        self.prices = PriceRingBuffer()
+        self._buffer_day: date | None = None
+        # Estimates days that OMIE has not published yet
+        self.estimator = (
+            DayAheadEstimator() if entry.data.get("estimate_tomorrow", False) else None
+        )
+        # Estimated slot prices of today and tomorrow while unpublished, by day offset
+        self._estimates: dict[int, list[float | None]] = {}
+        # Rank/percentile indexes of the current data, by (resolution, day)
+        self.price_indexes: dict[tuple[str, str], PriceIndex] = {}
+        # Battery schedules for the current (data version, first slot)
+        self._dispatch_cache_key: tuple[int, int] | None = None
+        self._dispatch_cache: dict[tuple, dict] = {}
+        # Hourly price dicts of the current data version, by (day offset, estimate)
+        self._hourly_cache_version: int | None = None
+        self._hourly_cache: dict[tuple[int, bool], dict[str, float | None]] = {}
 
         super().__init__(
             hass,
@@ -40,16 +80,360 @@ class CoopernicoDataUpdateCoordinator(DataUpdateCoordinator):
     async def _async_update_data(self) -> dict:
         """Fetch data from OMIE and calculate Coopernico prices."""
         try:
-            date_ini = date.today()
+            date_ini = self.now().date()
             date_end = date_ini + timedelta(days=7)
-
-            data = await self.hass.async_add_executor_job(
-                self.client.fetch_and_calculate_prices, date_ini, date_end
-            )
+            data = await self._async_compute_prices(date_ini, date_end)
 
             if not data:
                 raise UpdateFailed("No data received from OMIE")
 
+            self._advance_day()
+            curve = data["curve_15min"]
+            if curve["start"] is not None:
+                self.prices.write(curve["start"] // CURVE_STEP, curve["values"])
+            if self.estimator is not None:
+                try:
+                    self.estimator.fit_curve(curve)
+                except Exception as err:
+                    # Estimates are optional; never fail the refresh for them
+                    _LOGGER.warning("Could not update price estimates: %s", err)
+            self.data_version += 1
+            self._build_price_indexes()
             return data
         except Exception as err:
             raise UpdateFailed(f"Error communicating with OMIE: {err}") from err
+
+    async def _async_compute_prices(self, date_ini: date, date_end: date) -> dict:
+        """Fetch and compute prices in the worker process or the executor."""
+        if not self.use_process_pool:
+            return await self.hass.async_add_executor_job(
+                self.client.fetch_and_calculate_prices, date_ini, date_end
+            )
+
+        try:
+            return await self.hass.loop.run_in_executor(
+                get_executor(), compute_prices, self.client, date_ini, date_end
+            )
+        except BrokenProcessPool:
+            # Start a fresh worker on the next refresh
+            shutdown_executor()
+            raise
+
+    async def async_warm_up_estimator(self) -> None:
+        """
+        Fit a fresh estimator on the last published days, then swap it in.
+        Started once in the background after setup; if it fails, the estimator
+        keeps learning from the days published while running.
+        """
+        today = self.now().date()
+        try:
+            history = await self._async_compute_prices(
+                today - timedelta(days=ESTIMATOR_HISTORY_DAYS),
+                today - timedelta(days=1),
+            )
+            estimator = DayAheadEstimator()
+            if history:
+                estimator.fit_curve(history["curve_15min"])
+            # Catch up with the days fetched by refreshes meanwhile
+            if self.data:
+                estimator.fit_curve(self.data["curve_15min"])
+        except Exception as err:
+            _LOGGER.warning("Could not fetch price history for estimates: %s", err)
+            return
+
+        self.estimator = estimator
+        if self.data is not None:
+            self.data_version += 1
+            self._build_price_indexes()
+            self.async_update_listeners()
+
+    def _advance_day(self) -> bool:
+        """Drop the days before yesterday from the buffer when the date changes."""
+        today = self.now().date()
+        if today == self._buffer_day:
+            return False
+
+        self._buffer_day = today
+        self.prices.advance(self._day_bounds(-1)[0])
+        return True
+
+    @callback
+    def async_roll_over(self, _now: datetime | None = None) -> None:
+        """Shift today/tomorrow at midnight without fetching or recomputing prices."""
+        if self._advance_day() and self.data is not None:
+            self.data_version += 1
+            self._build_price_indexes()
+            self.async_update_listeners()
+
+    def _build_price_indexes(self) -> None:
+        """Rebuild the estimates and rank indexes of today and tomorrow from the buffer."""
+        self._estimates = {}
+        if self.estimator is not None:
+            for day_offset in (0, 1):
+                first, end = self._day_bounds(day_offset)
+                published = self.prices.window(first, end - first)
+                if any(price is not None for price in published):
+                    continue
+                day = self.now().date() + timedelta(days=day_offset)
+                if (estimate := self.estimator.estimate(day)) is not None:
+                    skipped = [
+                        hour for hour in range(24) if self._is_skipped(day, hour)
+                    ]
+                    self._estimates[day_offset] = [
+                        None if index // 4 in skipped else price
+                        for index, price in enumerate(estimate)
+                    ]
+
+        self.price_indexes = {}
+        for day_offset, day in enumerate(("today", "tomorrow")):
+            self.price_indexes[("hourly", day)] = PriceIndex(
+                self.hourly_prices(day_offset)
+            )
+            self.price_indexes[("15min", day)] = PriceIndex(
+                self.interval_prices(day_offset)
+            )
+
+    @staticmethod
+    def slot_of(when: datetime) -> int:
+        """Return the absolute quarter-hour slot containing a time."""
+        return int(when.timestamp()) // CURVE_STEP
+
+    @staticmethod
+    def _is_skipped(day: date, hour: int) -> bool:
+        """Return True if the spring DST change skips an hour of a day."""
+        start = datetime.combine(day, time(hour), LISBON_TZ)
+        return start.astimezone(timezone.utc).astimezone(LISBON_TZ).hour != hour
+
+    def _day_bounds(self, day_offset: int) -> tuple[int, int]:
+        """Return the [first, end) slots of a day relative to today."""
+        day = self.now().date() + timedelta(days=day_offset)
+        start = datetime.combine(day, time.min, LISBON_TZ)
+        end = datetime.combine(day + timedelta(days=1), time.min, LISBON_TZ)
+        return self.slot_of(start), self.slot_of(end)
+
+    def price_at(self, when: datetime) -> float | None:
+        """Return the price of the quarter-hour containing a time."""
+        return self.prices.get(self.slot_of(when))
+
+    def is_estimated(self, day_offset: int) -> bool:
+        """
+        Return True if a day has no published price and an estimate is available.
+        Only today and tomorrow are estimated, once per data version.
+        """
+        return day_offset in self._estimates
+
+    def slot_price(
+        self, day_offset: int, hour: int, minute: int, estimate: bool = False
+    ) -> float | None:
+        """
+        Return the price of a quarter-hour of a day relative to today.
+        With estimate, days not published yet are served from the estimator.
+        """
+        day = self.now().date() + timedelta(days=day_offset)
+        if self._is_skipped(day, hour):
+            return None
+        if estimate and (estimated := self._estimates.get(day_offset)) is not None:
+            return estimated[hour * 4 + minute // 15]
+        return self.price_at(datetime.combine(day, time(hour, minute), LISBON_TZ))
+
+    def hour_average(
+        self, day_offset: int, hour: int, estimate: bool = False
+    ) -> float | None:
+        """
+        Return the average price of an hour of a day relative to today.
+        The hour repeated by the autumn DST change averages both of its passes.
+        """
+        day = self.now().date() + timedelta(days=day_offset)
+        if self._is_skipped(day, hour):
+            return None
+        if estimate and (estimated := self._estimates.get(day_offset)) is not None:
+            prices = estimated[hour * 4 : hour * 4 + 4]
+            return sum(prices) / len(prices)
+
+        start = datetime.combine(day, time(hour), LISBON_TZ)
+        # The second pass (fold=1) only differs from the first on the autumn DST day
+        first = self.slot_of(start)
+        end = self.slot_of(start.replace(fold=1)) + 3600 // CURVE_STEP
+        prices = [
+            price for price in self.prices.window(first, end - first) if price is not None
+        ]
+        return sum(prices) / len(prices) if prices else None
+
+    def hourly_prices(
+        self, day_offset: int, estimate: bool = False
+    ) -> dict[str, float | None]:
+        """
+        Return the hourly average prices (H00-H23) of a day relative to today.
+        Cached per data version, which every refresh and day rollover bumps.
+        """
+        if self._hourly_cache_version != self.data_version:
+            self._hourly_cache_version = self.data_version
+            self._hourly_cache.clear()
+
+        key = (day_offset, estimate)
+        if (cached := self._hourly_cache.get(key)) is None:
+            cached = self._hourly_cache[key] = {
+                f"H{hour:02d}": self.hour_average(day_offset, hour, estimate)
+                for hour in range(24)
+            }
+        return cached
+
+    def interval_prices(self, day_offset: int) -> dict[str, float | None]:
+        """Return the 15-minute prices (H00M00-H23M45) of a day relative to today."""
+        return {
+            f"H{hour:02d}M{minute:02d}": self.slot_price(day_offset, hour, minute)
+            for hour in range(24)
+            for minute in (0, 15, 30, 45)
+        }
+
+    def daily_average(self, day_offset: int, estimate: bool = False) -> float | None:
+        """Return the average quarter-hour price of a day relative to today."""
+        if estimate and (estimated := self._estimates.get(day_offset)) is not None:
+            # Slots skipped by the spring DST change are None
+            prices = [price for price in estimated if price is not None]
+        else:
+            first, end = self._day_bounds(day_offset)
+            prices = [
+                price
+                for price in self.prices.window(first, end - first)
+                if price is not None
+            ]
+        return sum(prices) / len(prices) if prices else None
+
+    def upcoming_prices(self, hours: int) -> Iterator[float | None]:
+        """Iterate over the quarter-hour prices of the next hours, from the current slot."""
+        return self.prices.window(self.slot_of(self.now()), hours * 3600 // CURVE_STEP)
+
+    def price_curve(self) -> dict:
+        """
+        Return the packed quarter-hour price curve from today on, with its data version.
+        Prices are rounded to 4 decimals like the sensor states.
+        """
+        first = self._day_bounds(0)[0]
+        end = self.prices.end_slot
+        if end is None or end <= first:
+            return {
+                "version": self.data_version,
+                "start": None,
+                "step": CURVE_STEP,
+                "values": [],
+            }
+
+        return {
+            "version": self.data_version,
+            "start": first * CURVE_STEP,
+            "step": CURVE_STEP,
+            "values": [
+                round(price, 4) if price is not None else None
+                for price in self.prices.window(first, end - first)
+            ],
+        }
+
+    async def async_optimize_dispatch(
+        self,
+        capacity_kwh: float,
+        max_power_kw: float,
+        efficiency: float,
+        initial_soc_kwh: float,
+    ) -> dict:
+        """
+        Return the battery schedule for the published prices from the current slot on.
+        Schedules are cached per data version, current slot and battery parameters.
+        """
+        curve = self.price_curve()
+        if curve["start"] is None:
+            return {"value": 0.0, "schedule": []}
+
+        step = curve["step"]
+        now = self.now()
+        first = max(0, (int(now.timestamp()) - curve["start"]) // step)
+        prices = []
+        for price in curve["values"][first:]:
+            if price is None:
+                break
+            prices.append(price)
+
+        cache_key = (curve["version"], first)
+        if cache_key != self._dispatch_cache_key:
+            self._dispatch_cache_key = cache_key
+            self._dispatch_cache.clear()
+
+        params = (capacity_kwh, max_power_kw, efficiency, initial_soc_kwh)
+        if (cached := self._dispatch_cache.get(params)) is not None:
+            return cached
+
+        step_hours = step / 3600
+        result = await self.hass.async_add_executor_job(
+            optimize_dispatch,
+            prices,
+            step_hours,
+            capacity_kwh,
+            max_power_kw,
+            efficiency,
+            initial_soc_kwh,
+        )
+
+        schedule = []
+        for index, (price, grid_kwh, soc_kwh) in enumerate(
+            zip(prices, result["grid_kwh"], result["soc_kwh"])
+        ):
+            start = datetime.fromtimestamp(
+                curve["start"] + (first + index) * step, LISBON_TZ
+            )
+            if grid_kwh > 0:
+                action = "charge"
+            elif grid_kwh < 0:
+                action = "discharge"
+            else:
+                action = "idle"
+            schedule.append(
+                {
+                    "start": start.isoformat(),
+                    "price": round(price, 4),
+                    "action": action,
+                    "power_kw": round(grid_kwh / step_hours, 3),
+                    "soc_kwh": round(soc_kwh, 3),
+                }
+            )
+
+        response = {
+            "version": curve["version"],
+            "value": round(result["value"], 4),
+            "schedule": schedule,
+        }
+        self._dispatch_cache[params] = response
+        return response
+
+    def price_rank(self, resolution: str, when: datetime) -> dict | None:
+        """
+        Return the rank and percentile of the price at the given time.
+        Resolution is "hourly" or "15min"; only today and tomorrow are indexed.
+        """
+        when = when.astimezone(LISBON_TZ)
+        today = self.now().date()
+        if when.date() == today:
+            day = "today"
+        elif when.date() == today + timedelta(days=1):
+            day = "tomorrow"
+        else:
+            return None
+
+        index = self.price_indexes.get((resolution, day))
+        if index is None:
+            return None
+
+        if resolution == "hourly":
+            key = f"H{when.hour:02d}"
+        else:
+            key = f"H{when.hour:02d}M{when.minute // 15 * 15:02d}"
+        if (rank := index.rank(key)) is None:
+            return None
+
+        return {
+            "day": day,
+            "key": key,
+            "price": round(index.price(key), 4),
+            "rank": rank,
+            "count": index.count,
+            "percentile": round(index.percentile(key), 2),
+        }
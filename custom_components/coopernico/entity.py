@@ -0,0 +1,32 @@
+"""Base entity for Coopernico."""
+from __future__ import annotations
+
+from datetime import datetime
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import CoopernicoDataUpdateCoordinator
+
+
+class CoopernicoEntity(CoordinatorEntity[CoopernicoDataUpdateCoordinator]):
+    """Coopernico entity, optionally also updated at every quarter-hour."""
+
+    # Set for entities whose state depends on the current slot
+    _track_slots = False
+
+    async def async_added_to_hass(self) -> None:
+        """Track quarter-hours when the state depends on the current slot."""
+        await super().async_added_to_hass()
+        if self._track_slots:
+            self.async_on_remove(
+                async_track_time_change(
+                    self.hass, self._async_slot_changed, minute=[0, 15, 30, 45], second=0
+                )
+            )
+
+    @callback
+    def _async_slot_changed(self, now: datetime) -> None:
+        """Write the state for the new slot."""
+        self.async_write_ha_state()
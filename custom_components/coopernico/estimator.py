@@ -0,0 +1,110 @@
+"""Day-ahead Coopernico price estimate used before OMIE publishes tomorrow."""
+from __future__ import annotations
+
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+LISBON_TZ = ZoneInfo("Europe/Lisbon")
+
+# Quarter-hours of a regular day, indexed by local hour * 4 + minute // 15
+DAY_SLOTS = 96
+# A published day has every slot, except the 4 skipped by the spring DST change
+MIN_DAY_SLOTS = 92
+
+
+def days_from_curve(curve: dict) -> dict[date, list[float | None]]:
+    """Split a packed quarter-hour curve into per-day lists of local slot prices."""
+    days: dict[date, list[float | None]] = {}
+    if curve.get("start") is None:
+        return days
+
+    for index, price in enumerate(curve["values"]):
+        when = datetime.fromtimestamp(curve["start"] + index * curve["step"], LISBON_TZ)
+        values = days.setdefault(when.date(), [None] * DAY_SLOTS)
+        slot = when.hour * 4 + when.minute // 15
+        # Keep the first pass of the hour repeated by the autumn DST change
+        if values[slot] is None:
+            values[slot] = price
+    return days
+
+
+class DayAheadEstimator:
+    """
+    Seasonal model of the quarter-hour curve, fitted incrementally per published day.
+    estimate = level + offset[day type] + profile[day type], where the level follows
+    the daily mean and each day type (weekday, Saturday, Sunday) keeps its own offset
+    and intraday shape, all as exponentially weighted averages.
+    """
+
+    def __init__(self, level_alpha: float = 0.5, profile_alpha: float = 0.2) -> None:
+        """Initialize an empty model."""
+        self.level_alpha = level_alpha
+        self.profile_alpha = profile_alpha
+        self.last_day: date | None = None
+        self._level: float | None = None
+        self._offsets = np.zeros(3)
+        self._profiles = np.zeros((3, DAY_SLOTS))
+        self._seen = np.zeros(3, dtype=bool)
+        self._estimates: dict[date, list[float]] = {}
+
+    @staticmethod
+    def _day_type(day: date) -> int:
+        """Return 0 for weekdays, 1 for Saturday and 2 for Sunday."""
+        return max(day.weekday() - 4, 0)
+
+    def fit_day(self, day: date, values: list[float | None]) -> bool:
+        """Update the model with a published day; older or incomplete days are skipped."""
+        if self.last_day is not None and day <= self.last_day:
+            return False
+
+        prices = np.array([np.nan if v is None else v for v in values], dtype=float)
+        known = ~np.isnan(prices)
+        if known.sum() < MIN_DAY_SLOTS:
+            return False
+
+        mean = float(prices[known].mean())
+        if self._level is None:
+            self._level = mean
+
+        day_type = self._day_type(day)
+        offset = mean - self._level
+        deviation = prices - mean
+        if not self._seen[day_type]:
+            self._profiles[day_type] = np.where(known, deviation, 0.0)
+            self._offsets[day_type] = offset
+            self._seen[day_type] = True
+        else:
+            profile = self._profiles[day_type]
+            profile[known] += self.profile_alpha * (deviation[known] - profile[known])
+            self._offsets[day_type] += self.profile_alpha * (
+                offset - self._offsets[day_type]
+            )
+        self._level += self.level_alpha * (mean - self._level)
+
+        self.last_day = day
+        self._estimates.clear()
+        return True
+
+    def fit_curve(self, curve: dict) -> None:
+        """Fit every new complete day of a packed quarter-hour curve, oldest first."""
+        for day, values in sorted(days_from_curve(curve).items()):
+            self.fit_day(day, values)
+
+    def estimate(self, day: date) -> list[float] | None:
+        """Return the estimated local slot prices of a day, cached until the next fit."""
+        if self._level is None:
+            return None
+        if (cached := self._estimates.get(day)) is not None:
+            return cached
+
+        day_type = self._day_type(day)
+        if not self._seen[day_type]:
+            # Fall back to the shape of any day type fitted so far
+            day_type = int(np.argmax(self._seen))
+        estimate = (
+            self._level + self._offsets[day_type] + self._profiles[day_type]
+        ).tolist()
+        self._estimates[day] = estimate
+        return estimate
@@ -2,7 +2,10 @@
 from __future__ import annotations
 
 import os
+import threading
+from collections.abc import Callable
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
@@ -11,14 +14,40 @@ from omie_data import get_omie_data
 
 LISBON_TZ = ZoneInfo("Europe/Lisbon")
 
+# MIBEL price zones and the keywords identifying their OMIE price column.
+# omie_data decodes the files ignoring non-UTF-8 bytes, which drops accented
+# letters: "portugués" arrives as "portugus" and "español" as "espaol".
+ZONE_PT = "PT"
+ZONE_ES = "ES"
+ZONE_COLUMN_KEYWORDS: dict[str, tuple[str, ...]] = {
+    ZONE_PT: ("portug",),
+    ZONE_ES: ("espaol", "españ", "espan", "spain", "spanish"),
+}
+
+# Price column (EUR/MWh) of the per-zone frames
+ZONE_PRICE_COLUMN = "price"
+
+# Per-day OMIE prices split by zone, shared by every client in the process
+_ZONE_PRICE_CACHE: dict[date, dict[str, pd.DataFrame]] = {}
+_ZONE_PRICE_CACHE_LOCK = threading.Lock()
+
+# Quarter-hour step of the packed price curve, in seconds
+CURVE_STEP = 900
+
+
+def lisbon_now() -> datetime:
+    """Return the current time in Portugal (the default client clock)."""
+    return datetime.now(LISBON_TZ)
+
 
 def _get_loss_profile_path() -> Path:
     """Get the path to the bundled loss profile Excel file."""
     return Path(__file__).parent / "perfil_perda_2026.xlsx"
 
 
+@lru_cache(maxsize=1)
 def _load_loss_profile() -> pd.DataFrame | None:
-    """Load the loss profile from the bundled Excel file."""
+    """Load the loss profile from the bundled Excel file (parsed once per process)."""
     profile_path = _get_loss_profile_path()
     if not profile_path.exists():
         return None
@@ -47,17 +76,24 @@ def _load_loss_profile() -> pd.DataFrame | None:
         return None
 
 
-def _get_portuguese_price_column(df: pd.DataFrame) -> str | None:
-    """Return the column name for Portuguese marginal price (EUR/MWh), or None."""
+def _get_zone_price_column(df: pd.DataFrame, zone: str) -> str | None:
+    """Return the column name for the zone's marginal price (EUR/MWh), or None."""
+    keywords = ZONE_COLUMN_KEYWORDS[zone]
+    for col in df.columns:
+        col_lower = col.lower()
+        # Prefer: marginal price for the zone (not import/export or power)
+        if ("marginal" in col_lower or "precio" in col_lower) and any(
+            keyword in col_lower for keyword in keywords
+        ):
+            return col
     for col in df.columns:
         col_lower = col.lower()
-        # Prefer: marginal price for Portugal (not import/export or power)
-        if ("marginal" in col_lower or "precio" in col_lower) and (
-            "portugus" in col_lower
-            or "portugal" in col_lower
-            or "portugués" in col_lower
+        if any(keyword in col_lower for keyword in keywords) and (
+            "price" in col_lower or "precio" in col_lower
         ):
             return col
+    if zone != ZONE_PT:
+        return None
     for col in df.columns:
         col_lower = col.lower()
         if "portugal" in col_lower or ("pt" in col_lower and "price" in col_lower):
@@ -69,6 +105,83 @@ def _get_portuguese_price_column(df: pd.DataFrame) -> str | None:
     return None
 
 
+def _fetch_zone_prices(
+    day: date, fetch_day: Callable[[datetime], pd.DataFrame | None] = get_omie_data
+) -> dict[str, pd.DataFrame]:
+    """
+    Fetch one OMIE day and split it into per-zone price frames.
+    Every zone is extracted from the same download; published days are cached
+    so config entries for other zones reuse them without fetching again.
+    """
+    # Only guard the cache itself: downloads must not block other entries
+    with _ZONE_PRICE_CACHE_LOCK:
+        if (cached := _ZONE_PRICE_CACHE.get(day)) is not None:
+            return cached
+
+    df_day = fetch_day(datetime.combine(day, datetime.min.time()))
+    if df_day is None or df_day.empty:
+        # Not published yet, try again on the next refresh
+        return {}
+
+    # Convert start_period to Portuguese timezone (Europe/Lisbon)
+    start_period = pd.to_datetime(df_day["start_period"])
+    if start_period.dt.tz is None:
+        # omie_data labels the periods midnight + n * 15 min, so the 92 or 100
+        # periods of DST days run past the wall clock: count them in real time
+        midnight = pd.Timestamp(day)
+        start_period = midnight.tz_localize(LISBON_TZ) + (start_period - midnight)
+    else:
+        start_period = start_period.dt.tz_convert(LISBON_TZ)
+
+    zone_prices = {}
+    for zone in ZONE_COLUMN_KEYWORDS:
+        price_col = _get_zone_price_column(df_day, zone)
+        if price_col is not None:
+            # Fixed column name so days with different OMIE headers concat cleanly
+            zone_prices[zone] = pd.DataFrame(
+                {"start_period": start_period, ZONE_PRICE_COLUMN: df_day[price_col]}
+            )
+
+    with _ZONE_PRICE_CACHE_LOCK:
+        # Another entry may have fetched the same day meanwhile
+        return _ZONE_PRICE_CACHE.setdefault(day, zone_prices)
+
+
+def _prune_zone_price_cache(oldest: date) -> None:
+    """Drop cached days older than the given date."""
+    with _ZONE_PRICE_CACHE_LOCK:
+        for day in [day for day in _ZONE_PRICE_CACHE if day < oldest]:
+            del _ZONE_PRICE_CACHE[day]
+
+
+def _pack_15min_curve(price_df: pd.DataFrame) -> dict:
+    """
+    Pack Coopernico prices into a contiguous quarter-hour series.
+    Returns {"start": epoch seconds of the first slot, "step": 900, "values": [...]},
+    with None for slots that have no price.
+    """
+    times = pd.to_datetime(price_df["datetime"])
+    if times.dt.tz is None:
+        times = times.dt.tz_localize(LISBON_TZ, ambiguous="NaT", nonexistent="NaT")
+
+    slots = (times - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=CURVE_STEP)
+    prices = (
+        pd.DataFrame({"slot": slots, "price": price_df["price_coopernico"].values})
+        .dropna()
+        .groupby("slot")["price"]
+        .mean()
+    )
+    if prices.empty:
+        return {"start": None, "step": CURVE_STEP, "values": []}
+
+    first_slot = int(prices.index.min())
+    values: list[float | None] = [None] * (int(prices.index.max()) - first_slot + 1)
+    for slot, price in prices.items():
+        values[int(slot) - first_slot] = float(price)
+
+    return {"start": first_slot * CURVE_STEP, "step": CURVE_STEP, "values": values}
+
+
 class CoopernicoOMIEClient:
     """Client for fetching OMIE data and calculating Coopernico prices."""
 
@@ -79,12 +192,22 @@ class CoopernicoOMIEClient:
         tarifa: str = "SIMPLES",
         diario: bool = True,
         go_enabled: bool = False,
+        zone: str = ZONE_PT,
+        clock: Callable[[], datetime] = lisbon_now,
+        fetch_day: Callable[[datetime], pd.DataFrame | None] = get_omie_data,
     ) -> None:
-        """Initialize the client."""
+        """
+        Initialize the client.
+        clock and fetch_day can be replaced (e.g. by the replay harness) to run
+        against simulated time and archived OMIE days; both must be picklable.
+        """
         self.margin_k = margin_k  # Coopernico margin €/kWh
         self.go_value = go_value if go_enabled else 0.0  # Guarantees of Origin €/kWh
         self.tarifa = tarifa
         self.diario = diario
+        self.zone = zone  # MIBEL price zone (PT or ES)
+        self.clock = clock
+        self.fetch_day = fetch_day
 
     def fetch_omie_marginal_prices(
         self, date_ini: date, date_end: date
@@ -92,48 +215,36 @@ class CoopernicoOMIEClient:
         """
         Fetch OMIE marginal price data for the given date range.
         Returns (raw_omie_df, price_df):
-          - raw_omie_df: Raw library DataFrame with start_period and Portuguese price column in EUR/MWh.
+          - raw_omie_df: DataFrame with start_period and the zone's "price" column in EUR/MWh.
           - price_df: DataFrame with datetime and price in €/kWh.
         """
+        _prune_zone_price_cache(date_ini - timedelta(days=1))
+
         all_data = []
         current_date = date_ini
 
         while current_date <= date_end:
-            date_dt = datetime.combine(current_date, datetime.min.time())
-            df_day = get_omie_data(date_dt)
+            zone_df = _fetch_zone_prices(current_date, self.fetch_day).get(self.zone)
 
-            if df_day is not None and not df_day.empty:
-                all_data.append(df_day)
+            if zone_df is not None and not zone_df.empty:
+                all_data.append(zone_df)
 
             current_date += timedelta(days=1)
 
         if not all_data:
             return pd.DataFrame(), pd.DataFrame()
 
-        combined_df = pd.concat(all_data, ignore_index=True)
-
-        # Convert start_period to Portuguese timezone (Europe/Lisbon)
-        start_period_series = pd.to_datetime(combined_df["start_period"])
-        if start_period_series.dt.tz is None:
-            start_period_pt = start_period_series.dt.tz_localize(LISBON_TZ)
-        else:
-            start_period_pt = start_period_series.dt.tz_convert(LISBON_TZ)
-        combined_df["start_period"] = start_period_pt
-        combined_df["datetime"] = combined_df["start_period"]
-
-        price_col = _get_portuguese_price_column(combined_df)
-        if price_col is None:
-            return pd.DataFrame(), combined_df
+        raw_omie_df = pd.concat(all_data, ignore_index=True)
+        price_col = ZONE_PRICE_COLUMN
 
         # Convert EUR/MWh to €/kWh and create price dataframe
         price_df = pd.DataFrame(
             {
-                "datetime": combined_df["datetime"],
-                "price_omie": combined_df[price_col] / 1000.0,  # Convert to €/kWh
+                "datetime": raw_omie_df["start_period"],
+                "price_omie": raw_omie_df[price_col] / 1000.0,  # Convert to €/kWh
             }
         )
 
-        raw_omie_df = combined_df[["start_period", price_col]].copy()
         return raw_omie_df, price_df
 
     def calculate_coopernico_price(
@@ -150,7 +261,7 @@ class CoopernicoOMIEClient:
     ) -> dict:
         """
         Fetch OMIE prices and calculate Coopernico prices using loss profile.
-        Returns a dictionary with current and future prices.
+        Returns a dictionary with the current price and the packed quarter-hour curve.
         """
         raw_omie_df, price_df = self.fetch_omie_marginal_prices(date_ini, date_end)
 
@@ -166,31 +277,30 @@ class CoopernicoOMIEClient:
             dt_min = datetime.combine(date_ini, datetime.min.time())
             loss_profile_filtered = loss_profile_df.loc[
                 (loss_profile_df["datetime"] < dt_max)
-                & (loss_profile_df["datetime"] > dt_min)
+                & (loss_profile_df["datetime"] >= dt_min)
             ].copy()
 
             if not loss_profile_filtered.empty:
-                # Create merge keys for both dataframes (15-minute intervals)
-                price_df["merge_key"] = pd.to_datetime(price_df["datetime"]).dt.floor(
-                    "15min"
+                # Create merge keys for both dataframes (15-minute intervals).
+                # The loss profile is in naive Lisbon wall time, so OMIE times are
+                # matched by wall time too; both passes of the repeated autumn
+                # hour take the loss factor of its first pass.
+                price_df["merge_key"] = (
+                    price_df["datetime"].dt.tz_localize(None).dt.floor("15min")
                 )
                 loss_profile_filtered["merge_key"] = pd.to_datetime(
                     loss_profile_filtered["datetime"]
                 ).dt.floor("15min")
+                loss_profile_filtered = loss_profile_filtered.drop_duplicates(
+                    "merge_key"
+                )
 
-                # Merge loss profile with OMIE price data (left join from loss profile)
-                merged_df = loss_profile_filtered.merge(
-                    price_df[["merge_key", "price_omie"]],
+                # Only keep rows with both OMIE and loss profile data
+                merged_df = price_df.merge(
+                    loss_profile_filtered[["merge_key", "BT"]],
                     on="merge_key",
-                    how="left",
+                    how="inner",
                 )
-                
-                # Only keep rows with both OMIE and loss profile data
-                merged_df = merged_df.dropna(subset=["price_omie"])
-                
-                # Filter to available OMIE data range (use datetime from loss profile)
-                available_end = price_df["merge_key"].max()
-                merged_df = merged_df[merged_df["datetime"] <= available_end]
 
                 if not merged_df.empty:
                     # Calculate Coopernico prices with loss factor: (OMIE + margin) * (1 + BT)
@@ -198,7 +308,7 @@ class CoopernicoOMIEClient:
                         merged_df["price_omie"] + self.margin_k
                     ) * (1 + merged_df["BT"]) + self.go_value
                     
-                    # Use the merged dataframe with datetime from loss profile
+                    # Keep the timezone-aware OMIE datetimes
                     price_df = merged_df[["datetime", "price_omie", "price_coopernico"]].copy()
                 else:
                     # No matching data, use default
@@ -217,7 +327,7 @@ class CoopernicoOMIEClient:
             )
 
         # Get current price
-        now = datetime.now(LISBON_TZ)
+        now = self.clock()
         current_prices = price_df[price_df["datetime"] <= now]
         current_price = (
             current_prices.iloc[-1]["price_coopernico"]
@@ -225,63 +335,10 @@ class CoopernicoOMIEClient:
             else None
         )
 
-        # Get hourly prices for today and tomorrow
-        price_df["date"] = price_df["datetime"].dt.date
-        price_df["hour"] = price_df["datetime"].dt.hour
-
-        today = date.today()
-        tomorrow = today + timedelta(days=1)
-
-        today_prices = price_df[price_df["date"] == today].copy()
-        tomorrow_prices = price_df[price_df["date"] == tomorrow].copy()
-
-        # Group by hour and get average
-        hourly_today = (
-            today_prices.groupby("hour")["price_coopernico"].mean().to_dict()
-        )
-        hourly_tomorrow = (
-            tomorrow_prices.groupby("hour")["price_coopernico"].mean().to_dict()
-        )
-
-        # Get 15-minute interval prices for today and tomorrow
-        price_df_15min = price_df.copy()
-        price_df_15min["date"] = price_df_15min["datetime"].dt.date
-        price_df_15min["hour"] = price_df_15min["datetime"].dt.hour
-        price_df_15min["minute"] = price_df_15min["datetime"].dt.minute
-        
-        today_15min = price_df_15min[price_df_15min["date"] == today].copy()
-        tomorrow_15min = price_df_15min[price_df_15min["date"] == tomorrow].copy()
-
-        # Create 15-minute interval data structure
-        def create_15min_dict(df_15min):
-            """Create a dict with 15-minute interval prices."""
-            result = {}
-            for _, row in df_15min.iterrows():
-                hour = int(row["hour"])
-                minute = int(row["minute"])
-                # Round minute to nearest 15-minute interval (0, 15, 30, 45)
-                minute_rounded = (minute // 15) * 15
-                key = f"H{hour:02d}M{minute_rounded:02d}"
-                result[key] = float(row["price_coopernico"])
-            return result
-
-        interval_15min_today = create_15min_dict(today_15min)
-        interval_15min_tomorrow = create_15min_dict(tomorrow_15min)
-
+        # Today/tomorrow views are served by the coordinator's ring buffer
         return {
             "current_price": current_price,
             "current_datetime": now.isoformat(),
-            "hourly_today": {f"H{h:02d}": hourly_today.get(h) for h in range(24)},
-            "hourly_tomorrow": {
-                f"H{h:02d}": hourly_tomorrow.get(h) for h in range(24)
-            },
-            "interval_15min_today": interval_15min_today,
-            "interval_15min_tomorrow": interval_15min_tomorrow,
-            "daily_average_today": today_prices["price_coopernico"].mean()
-            if not today_prices.empty
-            else None,
-            "daily_average_tomorrow": tomorrow_prices["price_coopernico"].mean()
-            if not tomorrow_prices.empty
-            else None,
-            "last_update": datetime.now(LISBON_TZ).isoformat(),
+            "curve_15min": _pack_15min_curve(price_df),
+            "last_update": self.clock().isoformat(),
         }
@@ -0,0 +1,87 @@
+"""Battery dispatch optimizer over the Coopernico quarter-hour price curve."""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+
+def optimize_dispatch(
+    prices: list[float],
+    step_hours: float,
+    capacity_kwh: float,
+    max_power_kw: float,
+    efficiency: float = 0.9,
+    initial_soc_kwh: float = 0.0,
+    resolution: int = 100,
+) -> dict:
+    """
+    Compute the charge/discharge schedule that maximizes the value of a battery.
+    Dynamic programming over a discretized state of charge: charging buys energy
+    at the slot price, discharging offsets consumption at the slot price, and the
+    round-trip efficiency is split evenly between charge and discharge. Energy
+    left in the battery at the end of the horizon is not valued.
+    Returns {"value": €, "grid_kwh": [...], "soc_kwh": [...]} where grid_kwh is
+    the energy drawn (positive) or delivered (negative) in each slot and soc_kwh
+    the state of charge at the end of each slot.
+    max_power_kw limits the grid side of both charge and discharge.
+    The state of charge is split into about `resolution` levels, chosen so that
+    charging at full power stores a whole number of levels per slot; usable
+    capacity is rounded down to the last whole level (less than 1 / resolution
+    of it) and discharge to the last whole level within the power limit.
+    """
+    if capacity_kwh <= 0 or max_power_kw <= 0 or step_hours <= 0:
+        raise ValueError("Capacity, power and step must be positive")
+    if not 0 < efficiency <= 1:
+        raise ValueError("Efficiency must be in (0, 1]")
+
+    horizon = len(prices)
+    eta = math.sqrt(efficiency)
+    power_kwh = max_power_kw * step_hours  # Grid energy at full power in one slot
+    charge_kwh = power_kwh * eta  # Stored by a full power charge slot
+    if charge_kwh >= capacity_kwh:
+        # Power never binds: the whole battery can be charged in a single slot
+        soc_steps = max_charge = resolution
+        level_kwh = capacity_kwh / resolution
+    else:
+        max_charge = math.ceil(resolution * charge_kwh / capacity_kwh)
+        level_kwh = charge_kwh / max_charge
+        soc_steps = int(capacity_kwh / level_kwh + 1e-9)
+    # Discharge losses let more stored energy out under the same grid limit
+    max_discharge = min(soc_steps, int(power_kwh / eta / level_kwh + 1e-9))
+    levels = soc_steps + 1
+
+    # Energy seen by the grid for every change of level in one slot
+    deltas = np.arange(-max_discharge, max_charge + 1)
+    grid_kwh = np.where(deltas > 0, deltas * level_kwh / eta, deltas * level_kwh * eta)
+
+    price_array = np.asarray(prices, dtype=float)
+    policy = np.zeros((horizon, levels), dtype=np.int16)
+    value_next = np.zeros(levels)
+    for slot in range(horizon - 1, -1, -1):
+        gains = -price_array[slot] * grid_kwh
+        best = np.full(levels, -np.inf)
+        best_delta = np.zeros(levels, dtype=np.int16)
+        # Smallest moves first so ties keep the battery idle
+        for index in np.argsort(np.abs(deltas), kind="stable"):
+            delta, gain = int(deltas[index]), gains[index]
+            # Level s moves to s + delta, which must stay within [0, soc_steps]
+            lo, hi = max(0, -delta), min(levels, levels - delta)
+            candidate = gain + value_next[lo + delta : hi + delta]
+            better = candidate > best[lo:hi]
+            best[lo:hi][better] = candidate[better]
+            best_delta[lo:hi][better] = delta
+        policy[slot] = best_delta
+        value_next = best
+
+    level = min(max(round(initial_soc_kwh / level_kwh), 0), soc_steps)
+    value = float(value_next[level]) if horizon else 0.0
+    schedule_grid: list[float] = []
+    schedule_soc: list[float] = []
+    for slot in range(horizon):
+        delta = int(policy[slot, level])
+        level += delta
+        schedule_grid.append(float(grid_kwh[delta + max_discharge]))
+        schedule_soc.append(level * level_kwh)
+
+    return {"value": value, "grid_kwh": schedule_grid, "soc_kwh": schedule_soc}
@@ -0,0 +1,62 @@
+"""Slot-indexed ring buffer of Coopernico quarter-hour prices."""
+from __future__ import annotations
+
+import math
+from array import array
+from collections.abc import Iterable, Iterator
+
+# Yesterday, today and the 8 fetched days ahead, with room for DST days
+BUFFER_SLOTS = 10 * 96
+
+
+class PriceRingBuffer:
+    """
+    Fixed-size ring buffer of prices indexed by absolute slot (epoch seconds // step).
+    A slot is stored at position slot % capacity, so dropping old days only moves
+    the first slot pointer and new days are written in place.
+    """
+
+    def __init__(self, capacity: int = BUFFER_SLOTS) -> None:
+        """Allocate the buffer once."""
+        self.capacity = capacity
+        self._values = array("d", [math.nan]) * capacity
+        self.first_slot: int | None = None  # Oldest slot kept
+        self.end_slot: int | None = None  # One past the newest slot written
+
+    def advance(self, first_slot: int) -> None:
+        """Drop every slot before first_slot."""
+        if self.first_slot is None:
+            self.first_slot = self.end_slot = first_slot
+        elif first_slot > self.first_slot:
+            self.first_slot = first_slot
+            self.end_slot = max(self.end_slot, first_slot)
+
+    def write(self, start_slot: int, values: Iterable[float | None]) -> None:
+        """Store consecutive slot prices from start_slot; None marks a missing price."""
+        if self.first_slot is None:
+            self.advance(start_slot)
+
+        last_slot = self.first_slot + self.capacity
+        for slot, value in enumerate(values, start_slot):
+            if slot < self.first_slot:
+                continue
+            if slot >= last_slot:
+                break
+            # Positions exposed for the first time may still hold dropped slots
+            while self.end_slot < slot:
+                self._values[self.end_slot % self.capacity] = math.nan
+                self.end_slot += 1
+            self._values[slot % self.capacity] = math.nan if value is None else value
+            self.end_slot = max(self.end_slot, slot + 1)
+
+    def get(self, slot: int) -> float | None:
+        """Return the price of a slot, or None if it is not stored."""
+        if self.first_slot is None or not self.first_slot <= slot < self.end_slot:
+            return None
+        value = self._values[slot % self.capacity]
+        return None if math.isnan(value) else value
+
+    def window(self, start_slot: int, count: int) -> Iterator[float | None]:
+        """Iterate over count slot prices from start_slot without copying."""
+        for slot in range(start_slot, start_slot + count):
+            yield self.get(slot)
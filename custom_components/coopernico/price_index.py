@@ -0,0 +1,35 @@
+"""Rank and percentile index over the Coopernico day prices."""
+from __future__ import annotations
+
+from bisect import bisect_left
+
+
+class PriceIndex:
+    """Rank (1 = cheapest) and percentile of every price of one day."""
+
+    def __init__(self, prices: dict[str, float | None]) -> None:
+        """Sort the prices once so lookups are constant time."""
+        self._prices = prices
+        sorted_prices = sorted(price for price in prices.values() if price is not None)
+        self.count = len(sorted_prices)
+        # Equal prices share the best rank
+        self._ranks = {
+            key: bisect_left(sorted_prices, price) + 1
+            for key, price in prices.items()
+            if price is not None
+        }
+
+    def price(self, key: str) -> float | None:
+        """Return the price at key."""
+        return self._prices.get(key)
+
+    def rank(self, key: str) -> int | None:
+        """Return the rank of the price at key, 1 being the cheapest."""
+        return self._ranks.get(key)
+
+    def percentile(self, key: str) -> float | None:
+        """Return the share of the day's prices (0-100) cheaper than the one at key."""
+        if (rank := self._ranks.get(key)) is None:
+            return None
+        return 100.0 * (rank - 1) / self.count
+
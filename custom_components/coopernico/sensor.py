@@ -1,7 +1,7 @@
 """Sensor platform for Coopernico."""
 from __future__ import annotations
 
-from datetime import date, datetime, timedelta
+from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
 from homeassistant.components.sensor import (
@@ -14,11 +14,15 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, ROLLING_WINDOW_HOURS
 from .coordinator import CoopernicoDataUpdateCoordinator
+from .entity import CoopernicoEntity
 
 LISBON_TZ = ZoneInfo("Europe/Lisbon")
 
+# Day offset from today of the day sensors
+DAY_OFFSETS = {"today": 0, "tomorrow": 1}
+
 SENSOR_DESCRIPTIONS: tuple[SensorEntityDescription, ...] = (
     SensorEntityDescription(
         key="current_price",
@@ -71,10 +75,14 @@ async def async_setup_entry(
                     Coopernico15MinSensor(coordinator, hour, minute, day)
                 )
 
+    # Add rolling-window sensors for the next hours
+    for hours in ROLLING_WINDOW_HOURS:
+        entities.append(CoopernicoRollingAverageSensor(coordinator, hours))
+
     async_add_entities(entities)
 
 
-class CoopernicoSensor(CoordinatorEntity[CoopernicoDataUpdateCoordinator], SensorEntity):
+class CoopernicoSensor(CoopernicoEntity, SensorEntity):
     """Representation of a Coopernico sensor."""
 
     def __init__(
@@ -87,6 +95,8 @@ class CoopernicoSensor(CoordinatorEntity[CoopernicoDataUpdateCoordinator], Senso
         self.entity_description = description
         self._attr_unique_id = f"{coordinator.entry.entry_id}_{description.key}"
         self._attr_name = f"{coordinator.entry.title} {description.name}"
+        # The current price changes with every quarter-hour
+        self._track_slots = description.key == "current_price"
 
     @property
     def native_value(self) -> float | None:
@@ -94,7 +104,13 @@ class CoopernicoSensor(CoordinatorEntity[CoopernicoDataUpdateCoordinator], Senso
         if self.coordinator.data is None:
             return None
 
-        value = self.coordinator.data.get(self.entity_description.key)
+        key = self.entity_description.key
+        if key == "current_price":
+            value = self.coordinator.price_at(self.coordinator.now())
+        elif key == "daily_average_today":
+            value = self.coordinator.daily_average(0)
+        else:
+            value = self.coordinator.daily_average(1, estimate=True)
         return round(value, 4) if value is not None else None
 
     @property
@@ -105,17 +121,19 @@ class CoopernicoSensor(CoordinatorEntity[CoopernicoDataUpdateCoordinator], Senso
 
         attrs = {
             "last_update": self.coordinator.data.get("last_update"),
-            "current_datetime": self.coordinator.data.get("current_datetime"),
+            "current_datetime": self.coordinator.now().isoformat(),
         }
 
         # Add hourly prices as attributes
         if self.entity_description.key == "current_price":
-            attrs["hourly_today"] = self.coordinator.data.get("hourly_today", {})
-            attrs["hourly_tomorrow"] = self.coordinator.data.get("hourly_tomorrow", {})
+            attrs["hourly_today"] = self.coordinator.hourly_prices(0)
+            attrs["hourly_tomorrow"] = self.coordinator.hourly_prices(1, estimate=True)
+            attrs["tomorrow_estimated"] = self.coordinator.is_estimated(1)
         elif self.entity_description.key == "daily_average_today":
-            attrs["hourly_prices"] = self.coordinator.data.get("hourly_today", {})
+            attrs["hourly_prices"] = self.coordinator.hourly_prices(0)
         elif self.entity_description.key == "daily_average_tomorrow":
-            attrs["hourly_prices"] = self.coordinator.data.get("hourly_tomorrow", {})
+            attrs["hourly_prices"] = self.coordinator.hourly_prices(1, estimate=True)
+            attrs["estimated"] = self.coordinator.is_estimated(1)
 
         return attrs
 
@@ -146,10 +164,9 @@ class CoopernicoHourlySensor(CoordinatorEntity[CoopernicoDataUpdateCoordinator],
         if self.coordinator.data is None:
             return None
 
-        hourly_key = f"hourly_{self.day}"
-        hourly_data = self.coordinator.data.get(hourly_key, {})
-        price_key = f"H{self.hour:02d}"
-        value = hourly_data.get(price_key)
+        value = self.coordinator.hour_average(
+            DAY_OFFSETS[self.day], self.hour, estimate=True
+        )
         return round(value, 4) if value is not None else None
 
     @property
@@ -161,6 +178,7 @@ class CoopernicoHourlySensor(CoordinatorEntity[CoopernicoDataUpdateCoordinator],
         return {
             "hour": self.hour,
             "day": self.day,
+            "estimated": self.coordinator.is_estimated(DAY_OFFSETS[self.day]),
             "last_update": self.coordinator.data.get("last_update"),
         }
 
@@ -197,10 +215,9 @@ class Coopernico15MinSensor(CoordinatorEntity[CoopernicoDataUpdateCoordinator],
         if self.coordinator.data is None:
             return None
 
-        interval_key = f"interval_15min_{self.day}"
-        interval_data = self.coordinator.data.get(interval_key, {})
-        price_key = f"H{self.hour:02d}M{self.minute:02d}"
-        value = interval_data.get(price_key)
+        value = self.coordinator.slot_price(
+            DAY_OFFSETS[self.day], self.hour, self.minute, estimate=True
+        )
         return round(value, 4) if value is not None else None
 
     @property
@@ -210,7 +227,7 @@ class Coopernico15MinSensor(CoordinatorEntity[CoopernicoDataUpdateCoordinator],
             return {}
 
         # Calculate the actual datetime for this interval
-        today = date.today()
+        today = self.coordinator.now().date()
         target_date = today if self.day == "today" else today + timedelta(days=1)
         interval_datetime = datetime.combine(
             target_date, datetime.min.time().replace(hour=self.hour, minute=self.minute)
@@ -221,5 +238,64 @@ class Coopernico15MinSensor(CoordinatorEntity[CoopernicoDataUpdateCoordinator],
             "minute": self.minute,
             "day": self.day,
             "datetime": interval_datetime.isoformat(),
+            "estimated": self.coordinator.is_estimated(DAY_OFFSETS[self.day]),
+            "last_update": self.coordinator.data.get("last_update"),
+        }
+
+
+class CoopernicoRollingAverageSensor(CoopernicoEntity, SensorEntity):
+    """Representation of a Coopernico average price over the next hours."""
+
+    _track_slots = True
+
+    def __init__(
+        self,
+        coordinator: CoopernicoDataUpdateCoordinator,
+        hours: int,
+    ) -> None:
+        """Initialize the rolling-window sensor."""
+        super().__init__(coordinator)
+        self.hours = hours
+        self._attr_unique_id = f"{coordinator.entry.entry_id}_next_{hours}h_average"
+        self._attr_name = (
+            f"{coordinator.entry.title} Coopernico Average (Next {hours}h)"
+        )
+        self._attr_native_unit_of_measurement = "€/kWh"
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_icon = "mdi:chart-timeline-variant"
+
+    def _window_stats(self) -> tuple[int, float, float | None, float | None]:
+        """Return (count, total, min, max) of the published prices in the window."""
+        count, total, low, high = 0, 0.0, None, None
+        for price in self.coordinator.upcoming_prices(self.hours):
+            if price is None:
+                continue
+            count += 1
+            total += price
+            low = price if low is None else min(low, price)
+            high = price if high is None else max(high, price)
+        return count, total, low, high
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the average price of the published slots in the window."""
+        if self.coordinator.data is None:
+            return None
+
+        count, total, _, _ = self._window_stats()
+        return round(total / count, 4) if count else None
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return additional state attributes."""
+        if self.coordinator.data is None:
+            return {}
+
+        count, _, low, high = self._window_stats()
+        return {
+            "hours": self.hours,
+            "slots": count,
+            "min": round(low, 4) if low is not None else None,
+            "max": round(high, 4) if high is not None else None,
             "last_update": self.coordinator.data.get("last_update"),
         }
@@ -0,0 +1,105 @@
+"""Services for the Coopernico integration."""
+from __future__ import annotations
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_CAPACITY_KWH,
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_DATETIME,
+    ATTR_EFFICIENCY,
+    ATTR_INITIAL_SOC_KWH,
+    ATTR_MAX_POWER_KW,
+    ATTR_RESOLUTION,
+    DOMAIN,
+    SERVICE_OPTIMIZE_BATTERY,
+    SERVICE_PRICE_RANK,
+)
+from .coordinator import CoopernicoDataUpdateCoordinator
+
+OPTIMIZE_BATTERY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_CAPACITY_KWH): vol.All(
+            vol.Coerce(float), vol.Range(min=0, min_included=False)
+        ),
+        vol.Required(ATTR_MAX_POWER_KW): vol.All(
+            vol.Coerce(float), vol.Range(min=0, min_included=False)
+        ),
+        vol.Optional(ATTR_EFFICIENCY, default=0.9): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=1, min_included=False)
+        ),
+        vol.Optional(ATTR_INITIAL_SOC_KWH, default=0.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+    }
+)
+
+PRICE_RANK_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_RESOLUTION, default="hourly"): vol.In(["hourly", "15min"]),
+        vol.Optional(ATTR_DATETIME): cv.datetime,
+    }
+)
+
+
+def _get_coordinator(
+    hass: HomeAssistant, call: ServiceCall
+) -> CoopernicoDataUpdateCoordinator:
+    """Return the coordinator of the config entry targeted by the call."""
+    entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+    if (coordinator := hass.data.get(DOMAIN, {}).get(entry_id)) is None:
+        raise ServiceValidationError(f"Config entry {entry_id} not found")
+    return coordinator
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Coopernico services."""
+
+    async def async_optimize_battery(call: ServiceCall) -> ServiceResponse:
+        """Return the optimal battery charge/discharge schedule."""
+        coordinator = _get_coordinator(hass, call)
+        capacity_kwh = call.data[ATTR_CAPACITY_KWH]
+        return await coordinator.async_optimize_dispatch(
+            capacity_kwh=capacity_kwh,
+            max_power_kw=call.data[ATTR_MAX_POWER_KW],
+            efficiency=call.data[ATTR_EFFICIENCY],
+            initial_soc_kwh=min(call.data[ATTR_INITIAL_SOC_KWH], capacity_kwh),
+        )
+
+    async def async_price_rank(call: ServiceCall) -> ServiceResponse:
+        """Return the rank and percentile of the price at a given time."""
+        coordinator = _get_coordinator(hass, call)
+        when = dt_util.as_local(call.data.get(ATTR_DATETIME) or dt_util.now())
+        rank = coordinator.price_rank(call.data[ATTR_RESOLUTION], when)
+        if rank is None:
+            raise ServiceValidationError(f"No price available for {when.isoformat()}")
+        return rank
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PRICE_RANK,
+        async_price_rank,
+        schema=PRICE_RANK_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_OPTIMIZE_BATTERY,
+        async_optimize_battery,
+        schema=OPTIMIZE_BATTERY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
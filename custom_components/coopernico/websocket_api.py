@@ -0,0 +1,138 @@
+"""Websocket API for the Coopernico integration."""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN, SIGNAL_ENTRY_UNLOADED
+from .coordinator import CoopernicoDataUpdateCoordinator
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the Coopernico websocket commands."""
+    websocket_api.async_register_command(hass, ws_price_curve)
+    websocket_api.async_register_command(hass, ws_subscribe_price_curve)
+
+
+def curve_delta(old: dict, new: dict) -> dict | None:
+    """
+    Return the changes needed to turn the old packed curve into the new one.
+    The receiver shifts its values by (start - old start) / step slots, resizes
+    them to length and then applies each [index, value] pair of changes.
+    Returns None when both curves are identical.
+    """
+    step = new["step"]
+    if old["start"] is None or new["start"] is None or old["step"] != step:
+        return None if old == new else {**new, "full": True}
+
+    shift = (new["start"] - old["start"]) // step
+    old_values = old["values"]
+    changes = []
+    for index, value in enumerate(new["values"]):
+        old_index = index + shift
+        previous = old_values[old_index] if 0 <= old_index < len(old_values) else None
+        if value != previous:
+            changes.append([index, value])
+
+    if not changes and shift == 0 and len(new["values"]) == len(old_values):
+        return None
+
+    return {
+        "version": new["version"],
+        "start": new["start"],
+        "step": step,
+        "length": len(new["values"]),
+        "changes": changes,
+    }
+
+
+def _get_coordinator(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> CoopernicoDataUpdateCoordinator | None:
+    """Return the coordinator for the requested entry or send an error."""
+    coordinator = hass.data.get(DOMAIN, {}).get(msg["entry_id"])
+    if coordinator is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry not found"
+        )
+    return coordinator
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "coopernico/price_curve",
+        vol.Required("entry_id"): str,
+    }
+)
+@callback
+def ws_price_curve(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Return the packed quarter-hour price curve."""
+    if (coordinator := _get_coordinator(hass, connection, msg)) is None:
+        return
+
+    connection.send_result(msg["id"], coordinator.price_curve())
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "coopernico/subscribe_price_curve",
+        vol.Required("entry_id"): str,
+    }
+)
+@callback
+def ws_subscribe_price_curve(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """
+    Send the full price curve, then only deltas when new data is published.
+    The subscription ends with an error when the config entry unloads or reloads.
+    """
+    if (coordinator := _get_coordinator(hass, connection, msg)) is None:
+        return
+
+    last_curve: dict[str, Any] = coordinator.price_curve()
+
+    @callback
+    def _forward_delta() -> None:
+        nonlocal last_curve
+        curve = coordinator.price_curve()
+        if curve["version"] == last_curve["version"]:
+            return
+
+        delta = curve_delta(last_curve, curve)
+        last_curve = curve
+        if delta is not None:
+            connection.send_message(websocket_api.event_message(msg["id"], delta))
+
+    remove_listener = coordinator.async_add_listener(_forward_delta)
+
+    @callback
+    def _unsubscribe() -> None:
+        remove_listener()
+        remove_unload_listener()
+
+    @callback
+    def _entry_unloaded() -> None:
+        if connection.subscriptions.pop(msg["id"], None) is None:
+            return
+        _unsubscribe()
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry unloaded"
+        )
+
+    remove_unload_listener = async_dispatcher_connect(
+        hass, SIGNAL_ENTRY_UNLOADED.format(msg["entry_id"]), _entry_unloaded
+    )
+    connection.subscriptions[msg["id"]] = _unsubscribe
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(msg["id"], {**last_curve, "full": True})
+    )
@@ -0,0 +1,62 @@
+"""
+Persistent worker process for the Coopernico price computation.
+
+The spawned worker unpickles compute_prices by its qualified name, so it imports
+this package first: the package __init__ and with it the Home Assistant modules
+used by the integration are loaded once in the worker, at startup.
+"""
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Any
+
+from .omie_client import CoopernicoOMIEClient, _load_loss_profile
+
+_EXECUTOR: ProcessPoolExecutor | None = None
+
+
+def _init_worker() -> None:
+    """Parse the loss profile once when the worker process starts."""
+    _load_loss_profile()
+
+
+def _compact(value: Any) -> Any:
+    """Convert numpy scalars to builtins so results pickle small and cheap."""
+    if isinstance(value, dict):
+        return {key: _compact(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_compact(item) for item in value]
+    if isinstance(value, float):
+        return float(value)
+    return value
+
+
+def compute_prices(
+    client: CoopernicoOMIEClient, date_ini: date, date_end: date
+) -> dict:
+    """Run the price computation in the worker process."""
+    return _compact(client.fetch_and_calculate_prices(date_ini, date_end))
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Return the shared worker process executor, starting it if needed."""
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        # Spawn instead of fork: forking the running Home Assistant process is unsafe.
+        # The worker pays the package import graph (Home Assistant core included) once.
+        _EXECUTOR = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+    return _EXECUTOR
+
+
+def shutdown_executor() -> None:
+    """Stop the worker process, if it was started."""
+    global _EXECUTOR
+    if _EXECUTOR is not None:
+        _EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        _EXECUTOR = None
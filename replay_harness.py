@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Accelerated-clock replay harness for the Coopernico coordinator.
+
+Drives CoopernicoDataUpdateCoordinator and every sensor and binary sensor
+entity through simulated days, with a local OMIE stand-in serving archived
+days instead of the network. Reports refresh latency percentiles, memory
+growth and entity write counts.
+
+Record an archive of real OMIE days once (needs network):
+    python replay_harness.py --record archive/ --start 2025-01-01 --days 60
+
+Replay a simulated year at 1000x speed (use --speed 0 to run unthrottled):
+    python replay_harness.py --archive archive/ --start 2025-01-01 --days 365
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+try:
+    import pandas as pd
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.coopernico.binary_sensor import (
+        CoopernicoBelowPercentileBinarySensor,
+        CoopernicoCheapestHoursBinarySensor,
+    )
+    from custom_components.coopernico.const import (
+        DEFAULT_CHEAPEST_HOURS,
+        DEFAULT_PRICE_PERCENTILE,
+        ROLLING_WINDOW_HOURS,
+    )
+    from custom_components.coopernico.coordinator import (
+        CoopernicoDataUpdateCoordinator,
+    )
+    from custom_components.coopernico.sensor import (
+        SENSOR_DESCRIPTIONS,
+        Coopernico15MinSensor,
+        CoopernicoHourlySensor,
+        CoopernicoRollingAverageSensor,
+        CoopernicoSensor,
+    )
+except ImportError as e:
+    print(f"[ERROR] Missing dependency: {e}")
+    print("Install with: pip install homeassistant omie-market-data pandas openpyxl")
+    sys.exit(1)
+
+LISBON_TZ = ZoneInfo("Europe/Lisbon")
+UTC = ZoneInfo("UTC")
+# OMIE publishes the next day around 13:00 CET (12:00 in Lisbon)
+PUBLICATION_HOUR = 12
+TICK = timedelta(minutes=15)
+
+
+class ReplayClock:
+    """Simulated Lisbon clock advanced by the harness."""
+
+    def __init__(self, start: datetime) -> None:
+        self.current = start
+
+    def __call__(self) -> datetime:
+        return self.current
+
+    def advance(self, delta: timedelta) -> None:
+        # Step in UTC so DST transitions are crossed like real time
+        self.current = (self.current.astimezone(UTC) + delta).astimezone(LISBON_TZ)
+
+
+def day_periods(day: date) -> list[datetime]:
+    """Return the real start times of the quarter-hours of a Lisbon day (92, 96 or 100)."""
+    start = datetime.combine(day, datetime.min.time(), LISBON_TZ).astimezone(UTC)
+    end = datetime.combine(day + timedelta(days=1), datetime.min.time(), LISBON_TZ)
+    count = int((end.astimezone(UTC) - start) / TICK)
+    return [(start + index * TICK).astimezone(LISBON_TZ) for index in range(count)]
+
+
+class OMIEStandIn:
+    """
+    Serve archived OMIE days as if they were published for simulated days.
+    Frames keep the shape get_omie_data returns: one row per period of the day,
+    with naive start_period/end_period labelled midnight + n * 15 minutes.
+    """
+
+    def __init__(self, archive: Path, clock: ReplayClock) -> None:
+        self.clock = clock
+        self.days = {}
+        for path in sorted(archive.glob("*.csv")):
+            df_day = pd.read_csv(path)
+            for column in ["start_period", "end_period"]:
+                df_day[column] = pd.to_datetime(df_day[column])
+            self.days[date.fromisoformat(path.stem)] = df_day
+        self.archived = sorted(self.days)
+        self.requests = 0
+
+    def __call__(self, day_dt: datetime):
+        self.requests += 1
+        day = day_dt.date()
+        now = self.clock()
+        published_until = now.date() + timedelta(
+            days=1 if now.hour >= PUBLICATION_HOUR else 0
+        )
+        if day > published_until:
+            return None
+
+        if day in self.days:
+            return self.days[day].copy()
+
+        # Replay an archived day on the requested date, period by local wall time:
+        # a repeated autumn hour is served twice, a skipped spring hour dropped
+        source = self.archived[(day - self.archived[0]).days % len(self.archived)]
+        source_rows = {}
+        for row, when in enumerate(day_periods(source)):
+            source_rows.setdefault((when.hour, when.minute), row)
+        rows = []
+        for when in day_periods(day):
+            hour = when.hour
+            # Fall back to the previous hour where the source skipped this one
+            while (hour, when.minute) not in source_rows:
+                hour -= 1
+            rows.append(source_rows[(hour, when.minute)])
+
+        df_day = self.days[source].iloc[rows].reset_index(drop=True)
+        midnight = datetime.combine(day, datetime.min.time())
+        df_day["start_period"] = [midnight + index * TICK for index in range(len(rows))]
+        df_day["end_period"] = df_day["start_period"] + TICK
+        return df_day
+
+
+def record_archive(archive: Path, start: date, days: int) -> None:
+    """Download real OMIE days into the archive directory, as get_omie_data returns them."""
+    from omie_data import get_omie_data
+
+    archive.mkdir(parents=True, exist_ok=True)
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        df_day = get_omie_data(datetime.combine(day, datetime.min.time()))
+        if df_day is None or df_day.empty:
+            print(f"[WARNING] No data for {day}")
+            continue
+        df_day.to_csv(archive / f"{day.isoformat()}.csv", index=False)
+        print(f"[OK] Recorded {day}")
+
+
+def build_entities(coordinator):
+    """Create every entity the sensor and binary sensor platforms would add."""
+    entities = [CoopernicoSensor(coordinator, d) for d in SENSOR_DESCRIPTIONS]
+    for day in ["today", "tomorrow"]:
+        for hour in range(24):
+            entities.append(CoopernicoHourlySensor(coordinator, hour, day))
+            for minute in [0, 15, 30, 45]:
+                entities.append(Coopernico15MinSensor(coordinator, hour, minute, day))
+    for hours in ROLLING_WINDOW_HOURS:
+        entities.append(CoopernicoRollingAverageSensor(coordinator, hours))
+    entities += [
+        CoopernicoCheapestHoursBinarySensor(coordinator, DEFAULT_CHEAPEST_HOURS),
+        CoopernicoBelowPercentileBinarySensor(coordinator, DEFAULT_PRICE_PERCENTILE),
+    ]
+    # Entities that also write on every quarter-hour
+    slot_entities = [
+        entity for entity in entities if getattr(entity, "_track_slots", False)
+    ]
+    return entities, slot_entities
+
+
+class WriteCounter:
+    """Evaluate and serialize entity states the way a state write would."""
+
+    def __init__(self) -> None:
+        self.writes = 0
+        self.bytes = 0
+
+    def write(self, entity) -> None:
+        state = entity.is_on if hasattr(entity, "is_on") else entity.native_value
+        payload = json.dumps(
+            {"state": state, "attributes": entity.extra_state_attributes}, default=str
+        )
+        self.writes += 1
+        self.bytes += len(payload)
+
+
+def percentile(values, pct):
+    """Return the pct percentile of values (nearest rank)."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def replay(args) -> int:
+    """Run the simulation and print the report."""
+    start = datetime.combine(args.start, datetime.min.time(), LISBON_TZ)
+    clock = ReplayClock(start)
+    stand_in = OMIEStandIn(args.archive, clock)
+    if not stand_in.archived:
+        print(f"[ERROR] No archived days (*.csv) in {args.archive}")
+        return 1
+
+    hass = HomeAssistant(str(args.archive))
+    entry = SimpleNamespace(entry_id="replay", title="Replay", data={})
+    coordinator = CoopernicoDataUpdateCoordinator(
+        hass, entry, clock=clock, fetch_day=stand_in
+    )
+    # The harness drives refreshes itself; never schedule real-time ones
+    coordinator.update_interval = None
+
+    entities, slot_entities = build_entities(coordinator)
+    counter = WriteCounter()
+    coordinator.async_add_listener(
+        lambda: [counter.write(entity) for entity in entities]
+    )
+
+    tracemalloc.start()
+    latencies = []
+    failures = 0
+    memory = []
+    end = start + timedelta(days=args.days)
+    next_refresh = start
+    wall_start = time.perf_counter()
+
+    while clock() < end:
+        tick_started = time.perf_counter()
+        if clock() >= next_refresh:
+            refresh_started = time.perf_counter()
+            await coordinator.async_refresh()
+            latencies.append((time.perf_counter() - refresh_started) * 1000)
+            if not coordinator.last_update_success:
+                failures += 1
+            next_refresh = clock() + args.refresh_interval
+
+        # Hourly rollover check, as scheduled by async_setup_entry
+        if clock().minute == 0:
+            coordinator.async_roll_over()
+
+        for entity in slot_entities:
+            counter.write(entity)
+
+        if clock().hour == 0 and clock().minute == 0:
+            memory.append(tracemalloc.get_traced_memory()[0])
+
+        clock.advance(TICK)
+        if args.speed:
+            remaining = TICK.total_seconds() / args.speed
+            remaining -= time.perf_counter() - tick_started
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+
+    tracemalloc.stop()
+
+    print("Coopernico Replay Report")
+    print("=" * 50)
+    print(f"Simulated: {args.start} + {args.days} days in {time.perf_counter() - wall_start:.1f}s")
+    print(f"Archived days: {len(stand_in.archived)}, OMIE requests: {stand_in.requests}")
+    print(f"Refreshes: {len(latencies)} ({failures} failed)")
+    if latencies:
+        print(
+            "Refresh latency (ms): "
+            f"p50={statistics.median(latencies):.1f} "
+            f"p95={percentile(latencies, 95):.1f} "
+            f"p99={percentile(latencies, 99):.1f} "
+            f"max={max(latencies):.1f}"
+        )
+    if len(memory) > 1:
+        print(
+            f"Traced memory at midnight: first={memory[0] / 1e6:.1f}MB "
+            f"last={memory[-1] / 1e6:.1f}MB growth={(memory[-1] - memory[0]) / 1e6:+.1f}MB"
+        )
+    print(f"Entities: {len(entities)}")
+    print(f"Entity writes: {counter.writes} ({counter.bytes / 1e6:.1f}MB serialized)")
+
+    await hass.async_stop()
+    return 0 if not failures else 1
+
+
+def main():
+    """Parse arguments and record or replay."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--archive", type=Path, help="Directory of archived OMIE days")
+    parser.add_argument("--record", type=Path, help="Record real OMIE days into this directory")
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2025, 1, 1))
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--speed", type=float, default=1000.0, help="Simulated seconds per real second (0 = unthrottled)")
+    parser.add_argument("--refresh-minutes", type=int, default=60)
+    args = parser.parse_args()
+    args.refresh_interval = timedelta(minutes=args.refresh_minutes)
+
+    if args.record:
+        record_archive(args.record, args.start, args.days)
+        return 0
+    if not args.archive:
+        parser.error("--archive or --record is required")
+    return asyncio.run(replay(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,6 +20,18 @@ except ImportError as e:
 LISBON_TZ = ZoneInfo("Europe/Lisbon")
 
 
+def load_component_module(name):
+    """Load a module of the integration by path, without Home Assistant."""
+    import importlib.util
+    from pathlib import Path
+
+    path = Path(__file__).parent / "custom_components" / "coopernico" / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(f"coopernico_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
 def test_omie_connection():
     """Test fetching OMIE data."""
     print("\n=== Testing OMIE Connection ===")
@@ -119,6 +131,118 @@ def test_price_calculation():
         return False
 
 
+def test_zone_columns():
+    """Test that both zone price columns are found in OMIE headers as decoded."""
+    print("\n=== Testing Zone Price Columns ===")
+    try:
+        omie_client = load_component_module("omie_client")
+
+        # omie_data drops the accented letters when decoding the OMIE files
+        df = pd.DataFrame(
+            columns=[
+                "start_period",
+                "Precio marginal en el sistema portugus (EUR/MWh)",
+                "Precio marginal en el sistema espaol (EUR/MWh)",
+            ]
+        )
+        ok = True
+        for zone, expected in [
+            (omie_client.ZONE_PT, df.columns[1]),
+            (omie_client.ZONE_ES, df.columns[2]),
+        ]:
+            column = omie_client._get_zone_price_column(df, zone)
+            print(f"  {zone}: {column}")
+            if column != expected:
+                print(f"[WARNING] Wrong price column for {zone}")
+                ok = False
+
+        if ok:
+            print("[OK] Price columns found for every zone")
+        return ok
+    except Exception as e:
+        print(f"[ERROR] Error detecting zone columns: {e}")
+        return False
+
+
+def test_price_buffer():
+    """Test that the price ring buffer wraps around and drops old slots."""
+    print("\n=== Testing Price Ring Buffer ===")
+    try:
+        price_buffer = load_component_module("price_buffer")
+
+        ok = True
+        buffer = price_buffer.PriceRingBuffer(capacity=8)
+        buffer.write(100, [1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+        # Dropping the first 3 slots makes room for 3 more past the capacity
+        buffer.advance(103)
+        buffer.write(106, [7.0, 8.0, 9.0, 10.0, 11.0])
+        expected = [4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0, 11.0]
+        stored = list(buffer.window(103, 8))
+        print(f"  after wrap-around: {stored}")
+        if stored != expected:
+            print("[WARNING] Wrapped slots do not match the written prices")
+            ok = False
+        if buffer.get(102) is not None or buffer.get(111) is not None:
+            print("[WARNING] Slots outside the kept window are still readable")
+            ok = False
+
+        # Slots skipped by a later write must not expose dropped prices
+        buffer.advance(109)
+        buffer.write(113, [None, 14.0])
+        stored = list(buffer.window(109, 6))
+        print(f"  after a gap: {stored}")
+        if stored != [10.0, 11.0, None, None, None, 14.0]:
+            print("[WARNING] Gap slots expose dropped prices")
+            ok = False
+
+        if ok:
+            print("[OK] Ring buffer wraps around and drops old slots")
+        return ok
+    except Exception as e:
+        print(f"[ERROR] Error in price ring buffer: {e}")
+        return False
+
+
+def test_battery_optimizer():
+    """Test that the battery optimizer can use the full rated power."""
+    print("\n=== Testing Battery Optimizer ===")
+    try:
+        optimizer = load_component_module("optimizer")
+
+        # 8 cheap quarter-hours followed by 8 expensive ones
+        prices = [0.05] * 8 + [0.20] * 8
+        ok = True
+        for capacity_kwh, max_power_kw in [(20, 1.5), (30, 1.0), (10, 3.0), (1, 50.0)]:
+            result = optimizer.optimize_dispatch(
+                prices, 0.25, capacity_kwh, max_power_kw, efficiency=1.0
+            )
+            # Lossless: move as much energy as 2 cheap hours allow, at a 0.15 €/kWh spread
+            expected = min(capacity_kwh, max_power_kw * 2) * 0.15
+            print(f"  {capacity_kwh} kWh / {max_power_kw} kW: value {result['value']:.4f} € (expected {expected:.4f} €)")
+            if abs(result["value"] - expected) > 1e-6:
+                print("[WARNING] Optimizer did not use the full rated power")
+                ok = False
+            if max(result["soc_kwh"]) > capacity_kwh + 1e-9:
+                print("[WARNING] State of charge exceeds the capacity")
+                ok = False
+
+            # Lossy: the rated power limits what the grid sees, charging included
+            result = optimizer.optimize_dispatch(
+                prices, 0.25, capacity_kwh, max_power_kw, efficiency=0.9
+            )
+            peak_kw = max(abs(grid_kwh) for grid_kwh in result["grid_kwh"]) / 0.25
+            if peak_kw > max_power_kw + 1e-9:
+                print(f"[WARNING] Grid power {peak_kw:.3f} kW exceeds {max_power_kw} kW")
+                ok = False
+
+        if ok:
+            print("[OK] Optimizer uses the full rated power within power and capacity limits")
+        return ok
+    except Exception as e:
+        print(f"[ERROR] Error in battery optimizer: {e}")
+        return False
+
+
 def main():
     """Run all tests."""
     print("Coopernico Integration Test Script")
@@ -143,6 +267,9 @@ def main():
     results.append(test_omie_connection())
     results.append(test_loss_profile())
     results.append(test_price_calculation())
+    results.append(test_zone_columns())
+    results.append(test_price_buffer())
+    results.append(test_battery_optimizer())
     
     # Summary
     print("\n" + "=" * 50)